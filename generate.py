@@ -1,63 +1,99 @@
+import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+
 import ontoenv
-from rdflib import Namespace, URIRef
+from rdflib import Namespace, URIRef, plugin
 import brickschema
 import brickschema.namespaces as ns
 
-env = ontoenv.OntoEnv()
-ruleGraph = brickschema.Graph()
-allShapes = brickschema.Graph()
-ontologies = []
+logger = logging.getLogger(__name__)
 
 RULE = Namespace("urn:rule/")
-ruleGraph.add((RULE[-1], ns.RDF.type, ns.OWL.Ontology))
 
 
-def find_ttl_files(path):
+def new_graph():
+    """
+    Create a graph backed by the Rust Oxigraph store when oxrdflib is
+    installed; triple-pattern lookups there are much faster than rdflib's
+    pure-Python in-memory store
+    """
+    try:
+        return brickschema.Graph(store="Oxigraph")
+    except plugin.PluginException:
+        return brickschema.Graph()
+
+
+def find_ttl_files(path, _top=True):
+    """
+    Find all ttl files in a directory, skipping files in the topmost directory
+    """
+    for entry in os.scandir(path):
+        if entry.is_dir():
+            yield from find_ttl_files(entry.path, _top=False)
+        elif not _top and entry.name.endswith(".ttl"):
+            logger.info(entry.path)
+            yield entry.path
+
+
+def parse_file(filename):
     """
-    Find all ttl files in a directory
+    Parse a ttl file and return its triples as N-Triples, which the main
+    process can re-parse much faster than turtle
     """
-    for root, _, files in os.walk(path):
-        # skip files in topmost directory
-        if root == path:
-            continue
-        for file in files:
-            if file.endswith(".ttl"):
-                print(os.path.join(root, file))
-                allShapes.load_file(os.path.join(root, file))
-                yield os.path.join(root, file)
-
-
-for filename in find_ttl_files("."):
-    g = brickschema.Graph()
+    g = new_graph()
     g.load_file(filename)
-    env.import_dependencies(g)
-
-    ontology = next(iter(g.subjects(ns.RDF.type, ns.OWL.Ontology)))
-    ontologies.append(ontology)
-    ruleGraph.add((RULE[-1], ns.OWL.imports, ontology))
-
-    # for each shape, generate a new rule where the shape is the condition
-    # and the rule instantiates the target as an instance of that shape (class)
-    for shape in g.subjects(predicate=ns.RDF.type, object=ns.SH.NodeShape):
-        rule = RULE[str(shape).split(":")[-1]]
-        ruleGraph.add((rule, ns.RDF.type, ns.SH.NodeShape))
-        targetClasses = list(g.query(f"""SELECT ?type WHERE {{
-            <{shape}> rdfs:subClassOf*/sh:class ?type .
-        }}"""))
-        if not targetClasses:
-            continue
-        ruleGraph.add((rule, ns.SH.targetClass, targetClasses[0][0]))
-        ruleGraph.add((rule, ns.SH.rule, [
-            (ns.SH.condition, shape),
-            (ns.RDF.type, ns.SH.TripleRule),
-            (ns.SH["subject"], ns.SH["this"]),
-            (ns.SH["predicate"], ns.RDF.type),
-            (ns.SH["object"], shape),
-            (ns.SH["prefixes"], URIRef(ns.RDF)),
-        ]))
-
-
-
-ruleGraph.serialize("rules.ttl", format="turtle")
-allShapes.serialize("shapes.ttl", format="turtle")
+    return g.serialize(format="nt", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    env = ontoenv.OntoEnv()
+    ruleGraph = new_graph()
+    allShapes = new_graph()
+    ontologies = []
+
+    ruleGraph.add((RULE[-1], ns.RDF.type, ns.OWL.Ontology))
+
+    files = list(find_ttl_files("."))
+    with ProcessPoolExecutor() as executor:
+        parsed = list(zip(files, executor.map(parse_file, files)))
+
+    for filename, nt in parsed:
+        g = new_graph()
+        g.parse(data=nt, format="nt")
+        allShapes += g
+        env.import_dependencies(g)
+
+        ontology = g.value(predicate=ns.RDF.type, object=ns.OWL.Ontology)
+        ontologies.append(ontology)
+        ruleGraph.add((RULE[-1], ns.OWL.imports, ontology))
+
+        # for each shape, generate a new rule where the shape is the condition
+        # and the rule instantiates the target as an instance of that shape (class)
+        for shape in g.subjects(predicate=ns.RDF.type, object=ns.SH.NodeShape):
+            rule = RULE[str(shape).split(":")[-1]]
+            ruleGraph.add((rule, ns.RDF.type, ns.SH.NodeShape))
+            targetClass = next(
+                (
+                    cls
+                    for parent in g.transitive_objects(shape, ns.RDFS.subClassOf)
+                    for cls in g.objects(parent, ns.SH["class"])
+                ),
+                None,
+            )
+            if targetClass is None:
+                continue
+            ruleGraph.add((rule, ns.SH.targetClass, targetClass))
+            ruleGraph.add((rule, ns.SH.rule, [
+                (ns.SH.condition, shape),
+                (ns.RDF.type, ns.SH.TripleRule),
+                (ns.SH["subject"], ns.SH["this"]),
+                (ns.SH["predicate"], ns.RDF.type),
+                (ns.SH["object"], shape),
+                (ns.SH["prefixes"], URIRef(ns.RDF)),
+            ]))
+
+    ruleGraph.serialize("rules.ttl", format="turtle")
+    allShapes.serialize("shapes.ttl", format="turtle")
@@ -1,13 +1,39 @@
+import os
+import pickle
+
 import brickschema
 from rdflib import URIRef
 
-g = brickschema.Graph()
-g.load_file("/home/gabe/src/Brick/Brick/Brick.ttl")
-g.load_file("shapes.ttl")
-g.load_file("rules.ttl")
-g.load_file("example.ttl")
-valid, _, report = g.validate()
-assert valid, report
+BRICK = "/home/gabe/src/Brick/Brick/Brick.ttl"
+BRICK_CACHE = "Brick.pickle"
+
+
+def load_brick():
+    """
+    Load the Brick schema, using a pickled copy of the parsed graph to skip
+    the (slow) turtle parse on repeat runs
+    """
+    if os.path.exists(BRICK_CACHE):
+        with open(BRICK_CACHE, "rb") as f:
+            return pickle.load(f)
+    g = brickschema.Graph()
+    g.load_file(BRICK)
+    with open(BRICK_CACHE, "wb") as f:
+        pickle.dump(g, f)
+    return g
+
+
+def main():
+    g = load_brick()
+    g.load_file("shapes.ttl")
+    g.load_file("rules.ttl")
+    g.load_file("example.ttl")
+    valid, _, report = g.validate(engine="topquadrant")
+    assert valid, report
+
+    results = set(g.query("SELECT * WHERE { <urn:bldg#vav1> a ?type }"))
+    assert((URIRef('urn:ashrae/g36/4.1/vav-cooling-only/vav-cooling-only'),) in results)
+
 
-results = set(g.query("SELECT * WHERE { <urn:bldg#vav1> a ?type }"))
-assert((URIRef('urn:ashrae/g36/4.1/vav-cooling-only/vav-cooling-only'),) in results)
+if __name__ == "__main__":
+    main()